@@ -14,13 +14,19 @@
 
 """Helper functions for testing."""
 
+import functools
 import inspect
 import os
+import sys
 import unittest
 
+# Do not clutter the source tree with .pyc files when running the tests.
+sys.dont_write_bytecode = True
 
-def get_source_files() -> list[str]:
-    """Return a list of sources files/directories (to check with flake8/pylint)."""
+
+@functools.lru_cache(maxsize=1)
+def get_source_files() -> tuple[str, ...]:
+    """Return a tuple of sources files/directories (to check with flake8/pylint)."""
     scripts = [
         "copy-mtime",
         "dpkg-which",
@@ -48,7 +54,7 @@ def get_source_files() -> list[str]:
             files.append(code_file)
         else:
             files.append(code_file)
-    return files
+    return tuple(files)
 
 
 def unittest_verbosity() -> int:
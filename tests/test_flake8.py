@@ -31,7 +31,7 @@ class Flake8TestCase(unittest.TestCase):
 
     def test_flake8(self) -> None:
         """Test: Run flake8 on Python source code."""
-        cmd = [sys.executable, "-m", "flake8", "--"] + get_source_files()
+        cmd = [sys.executable, "-m", "flake8", "--", *get_source_files()]
         if unittest_verbosity() >= 2:
             sys.stderr.write(f"Running following command:\n{' '.join(cmd)}\n")
         process = subprocess.run(cmd, capture_output=True, check=False, text=True)
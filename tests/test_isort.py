@@ -14,13 +14,31 @@
 
 """Run isort to check if Python import definitions are sorted."""
 
-import subprocess
+import contextlib
+import io
+import os
+import pathlib
 import sys
 import unittest
 
+import isort
+
 from . import get_source_files, unittest_verbosity
 
 
+def _expand_directories(source_files: tuple[str, ...]) -> list[str]:
+    """Expand directories to the Python files they contain."""
+    python_files = []
+    for source_file in source_files:
+        if os.path.isdir(source_file):
+            python_files += sorted(
+                str(path) for path in pathlib.Path(source_file).rglob("*.py")
+            )
+        else:
+            python_files.append(source_file)
+    return python_files
+
+
 class IsortTestCase(unittest.TestCase):
     """
     This unittest class provides a test that runs isort to check if
@@ -30,13 +48,19 @@ class IsortTestCase(unittest.TestCase):
 
     def test_isort(self) -> None:
         """Test: Run isort on Python source code."""
-        cmd = ["isort", "--check-only", "--diff"] + get_source_files()
+        python_files = _expand_directories(get_source_files())
         if unittest_verbosity() >= 2:
-            sys.stderr.write(f"Running following command:\n{' '.join(cmd)}\n")
-        process = subprocess.run(cmd, capture_output=True, check=False, text=True)
+            sys.stderr.write(f"Checking following files with isort:\n{python_files}\n")
+        diff = io.StringIO()
+        with contextlib.redirect_stdout(diff):
+            unsorted = [
+                python_file
+                for python_file in python_files
+                if not isort.check_file(python_file, show_diff=True)
+            ]
 
-        if process.returncode != 0:  # pragma: no cover
+        if unsorted:  # pragma: no cover
             self.fail(
                 f"isort found unsorted Python import definitions:\n"
-                f"{process.stdout.strip()}"
+                f"{diff.getvalue().strip()}"
             )
@@ -14,14 +14,39 @@
 
 """Test linter test cases."""
 
+import concurrent.futures
 import contextlib
+import functools
 import io
 import os
+import re
+import subprocess
 import tempfile
 import unittest
 import unittest.mock
 
-from tests.test_shellcheck import run_shellcheck
+from tests.test_shellcheck import SHELLCHECK, run_shellcheck
+
+SHELLCHECK_VERSION_RE = re.compile("^version: ([0-9.]+)$", flags=re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=1)
+def get_shellcheck_version() -> tuple[int, ...]:
+    """Determine the version of the installed shellcheck (memoized)."""
+    output = subprocess.check_output([SHELLCHECK or "shellcheck", "--version"]).decode()
+    match = SHELLCHECK_VERSION_RE.search(output)
+    assert match
+    return tuple(int(part) for part in match.group(1).split("."))
+
+
+def shellcheck_level(level: str) -> str:
+    """Return the severity level the way shellcheck prints it.
+
+    shellcheck 0.8 and newer print the severity level after the finding code.
+    """
+    if get_shellcheck_version() < (0, 8):
+        return ""
+    return f" ({level})"
 
 
 class TestLinters(unittest.TestCase):
@@ -29,47 +54,61 @@ class TestLinters(unittest.TestCase):
     This unittest class tests the linter test cases.
     """
 
+    pass_sh: str
+    fail_sh: str
+    pass_future: concurrent.futures.Future[str]
+    fail_future: concurrent.futures.Future[str]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        if SHELLCHECK is None:  # pragma: no cover
+            raise unittest.SkipTest("shellcheck not installed")
+        tempdir = cls.enterClassContext(
+            # pylint: disable-next=consider-using-with
+            tempfile.TemporaryDirectory(prefix="test_linters-")
+        )
+        cls.pass_sh = os.path.join(tempdir, "pass.sh")
+        with open(cls.pass_sh, "w", encoding="utf-8") as shell_file:
+            shell_file.write("#!/bin/sh\n")
+        cls.fail_sh = os.path.join(tempdir, "fail.sh")
+        with open(cls.fail_sh, "w", encoding="utf-8") as shell_file:
+            shell_file.write("#!/bin/sh\necho $HOME\n")
+        # Run the shellcheck processes concurrently while the tests only
+        # check the results.
+        executor = cls.enterClassContext(
+            concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        )
+        cls.pass_future = executor.submit(run_shellcheck, [cls.pass_sh], False)
+        cls.fail_future = executor.submit(run_shellcheck, [cls.fail_sh], False)
+
     def test_shellcheck_succeeds(self) -> None:
         """shellchecks succeeds on shell code."""
-        with tempfile.TemporaryDirectory() as tempdir:
-            shell = os.path.join(tempdir, "test.sh")
-            with open(shell, "w", encoding="utf-8") as shell_file:
-                shell_file.write("#!/bin/sh\n")
-
-            self.assertEqual(run_shellcheck([shell], False), "")
+        self.assertEqual(self.pass_future.result(), "")
 
     def test_shellcheck_succeeds_verbose(self) -> None:
         """shellchecks succeeds on shell code in verbose mode."""
         stderr = io.StringIO()
-        with tempfile.TemporaryDirectory() as tempdir:
-            shell = os.path.join(tempdir, "test.sh")
-            with open(shell, "w", encoding="utf-8") as shell_file:
-                shell_file.write("#!/bin/sh\n")
-
-            with contextlib.redirect_stderr(stderr):
-                self.assertEqual(run_shellcheck([shell], True), "")
-            self.assertEqual(
-                stderr.getvalue(), f"Running following command:\nshellcheck {shell}\n"
-            )
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(run_shellcheck([self.pass_sh], True), "")
+        self.assertEqual(
+            stderr.getvalue(),
+            f"Running following command:\n{SHELLCHECK} {self.pass_sh}\n",
+        )
 
     def test_shellcheck_fails(self) -> None:
         """shellchecks fails on shell code."""
-        with tempfile.TemporaryDirectory() as tempdir:
-            shell = os.path.join(tempdir, "test.sh")
-            with open(shell, "w", encoding="utf-8") as shell_file:
-                shell_file.write("#!/bin/sh\necho $HOME\n")
-
-            self.assertEqual(
-                run_shellcheck([shell], False),
-                f"""shellcheck found issues:
+        self.assertEqual(
+            self.fail_future.result(),
+            f"""shellcheck found issues:
 
-In {shell} line 2:
+In {self.fail_sh} line 2:
 echo $HOME
-     ^---^ SC2086 (info): Double quote to prevent globbing and word splitting.
+     ^---^ SC2086{shellcheck_level('info')}: Double quote\
+ to prevent globbing and word splitting.
 
 Did you mean:{' '}
 echo "$HOME"
 
 For more information:
   https://www.shellcheck.net/wiki/SC2086 -- Double quote to prevent globbing ...""",
-            )
+        )
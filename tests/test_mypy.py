@@ -35,7 +35,8 @@ class MypyTestCase(unittest.TestCase):
             "--ignore-missing-imports",
             "--scripts-are-modules",
             "--strict",
-        ] + get_source_files()
+            *get_source_files(),
+        ]
         if unittest_verbosity() >= 2:
             sys.stderr.write(f"Running following command:\n{' '.join(cmd)}\n")
         process = subprocess.run(cmd, capture_output=True, check=False, text=True)
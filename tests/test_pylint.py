@@ -36,7 +36,7 @@ class PylintTestCase(unittest.TestCase):
 
     def test_pylint(self) -> None:
         """Test: Run pylint on Python source code."""
-        cmd = ["pylint", "--rcfile=" + CONFIG, "--"] + get_source_files()
+        cmd = ["pylint", "--rcfile=" + CONFIG, "--", *get_source_files()]
         if unittest_verbosity() >= 2:
             sys.stderr.write(f"Running following command:\n{' '.join(cmd)}\n")
         process = subprocess.run(cmd, capture_output=True, check=False, text=True)
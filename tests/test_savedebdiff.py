@@ -15,7 +15,11 @@
 """Test savedebdiff."""
 
 
+import io
 import os
+import pathlib
+import shutil
+import sys
 import tempfile
 import unittest
 import unittest.mock
@@ -94,6 +98,10 @@ diff -Nru update-manager-22.10.7/d/changelog update-manager-23.04.1/d/changelog
  [trailing space protection]
    * Use uaclient library instead of ua tool for Ubuntu Pro information.
 """
+LIBEVENT_CONTROL_PATCHSET = unidiff.PatchSet(LIBEVENT_CONTROL_DIFF)
+LIBEVENT_PATCHSET = unidiff.PatchSet(LIBEVENT_DEBDIFF)
+MISSING_VERSION_PATCHSET = unidiff.PatchSet(MISSING_VERSION_DEBDIFF)
+UPDATE_MANAGER_PATCHSET = unidiff.PatchSet(UPDATE_MANAGER_DEBDIFF)
 
 
 class TestSavedebdiff(unittest.TestCase):
@@ -102,87 +110,97 @@ class TestSavedebdiff(unittest.TestCase):
 
     PREFIX = "savedebdiff-"
 
+    root_tmpdir: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.root_tmpdir = tempfile.mkdtemp(prefix=cls.PREFIX)
+        cls.addClassCleanup(shutil.rmtree, cls.root_tmpdir)
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp(dir=self.root_tmpdir)
+
     def test_derive_filename_from_debdiff(self) -> None:
-        filename = derive_filename_from_debdiff(unidiff.PatchSet(LIBEVENT_DEBDIFF))
+        filename = derive_filename_from_debdiff(LIBEVENT_PATCHSET)
         self.assertEqual(filename, "libevent_2.1.12-stable-5ubuntu1.debdiff")
 
     def test_derive_filename_from_debdiff_missing_version(self) -> None:
-        missing_version = unidiff.PatchSet(MISSING_VERSION_DEBDIFF)
-        self.assertRaises(ValueError, derive_filename_from_debdiff, missing_version)
+        self.assertRaises(
+            ValueError, derive_filename_from_debdiff, MISSING_VERSION_PATCHSET
+        )
 
-    def test_derive_filename_from_debdiff_with_epoch(self) -> None:
-        filename = derive_filename_from_debdiff(
-            unidiff.PatchSet(UPDATE_MANAGER_DEBDIFF)
+    def test_derive_filename_from_debdiff_str(self) -> None:
+        filename = derive_filename_from_debdiff(LIBEVENT_DEBDIFF)
+        self.assertEqual(filename, "libevent_2.1.12-stable-5ubuntu1.debdiff")
+
+    def test_derive_filename_from_debdiff_str_missing_version(self) -> None:
+        self.assertRaises(
+            ValueError, derive_filename_from_debdiff, MISSING_VERSION_DEBDIFF
         )
+
+    def test_derive_filename_from_debdiff_with_epoch(self) -> None:
+        filename = derive_filename_from_debdiff(UPDATE_MANAGER_PATCHSET)
         self.assertEqual(filename, "update-manager_23.04.1.debdiff")
 
     def test_debian_changelog_not_found(self) -> None:
-        empty = unidiff.PatchSet(LIBEVENT_CONTROL_DIFF)
-        self.assertRaises(ChangelogNotFoundError, derive_filename_from_debdiff, empty)
-
-    @unittest.mock.patch("sys.stdin")
-    def test_main(self, stdin_mock: MagicMock) -> None:
-        stdin_mock.read.return_value = LIBEVENT_DEBDIFF
-        with tempfile.TemporaryDirectory(prefix=self.PREFIX) as tmpdir:
-            main(["--directory", tmpdir])
-            self.assertEqual(
-                os.listdir(tmpdir), ["libevent_2.1.12-stable-5ubuntu1.debdiff"]
-            )
-        stdin_mock.read.assert_called_once_with()
-
-    @unittest.mock.patch("sys.stdin")
-    def test_main_no_stdin(self, stdin_mock: MagicMock) -> None:
-        stdin_mock.read.return_value = ""
-        self.assertRaisesRegex(SystemExit, "1", main, [])
-        stdin_mock.read.assert_called_once_with()
+        self.assertRaises(
+            ChangelogNotFoundError,
+            derive_filename_from_debdiff,
+            LIBEVENT_CONTROL_PATCHSET,
+        )
+
+    def test_main(self) -> None:
+        stdin = io.StringIO(LIBEVENT_DEBDIFF)
+        with unittest.mock.patch.object(sys, "stdin", stdin):
+            main(["--directory", self.tmpdir])
+        self.assertEqual(
+            os.listdir(self.tmpdir), ["libevent_2.1.12-stable-5ubuntu1.debdiff"]
+        )
+        self.assertEqual(stdin.tell(), len(LIBEVENT_DEBDIFF))
+
+    def test_main_no_stdin(self) -> None:
+        with unittest.mock.patch.object(sys, "stdin", io.StringIO()):
+            self.assertRaisesRegex(SystemExit, "1", main, [])
 
     @unittest.mock.patch("subprocess.call")
-    @unittest.mock.patch("sys.stdin")
-    def test_main_open(self, stdin_mock: MagicMock, call_mock: MagicMock) -> None:
-        stdin_mock.read.return_value = LIBEVENT_DEBDIFF
+    def test_main_open(self, call_mock: MagicMock) -> None:
         expected_filename = "libevent_2.1.12-stable-5ubuntu1.debdiff"
-        with tempfile.TemporaryDirectory(prefix=self.PREFIX) as tmpdir:
-            main(["--directory", tmpdir, "--open"])
-            self.assertEqual(os.listdir(tmpdir), [expected_filename])
-            call_mock.assert_called_once_with(
-                ["xdg-open", os.path.join(tmpdir, expected_filename)]
-            )
-        stdin_mock.read.assert_called_once_with()
+        with unittest.mock.patch.object(sys, "stdin", io.StringIO(LIBEVENT_DEBDIFF)):
+            main(["--directory", self.tmpdir, "--open"])
+        self.assertTrue(os.path.isfile(os.path.join(self.tmpdir, expected_filename)))
+        call_mock.assert_called_once_with(
+            ["xdg-open", os.path.join(self.tmpdir, expected_filename)]
+        )
 
     @staticmethod
-    @unittest.mock.patch("sys.stdin")
-    def test_main_working_directory(stdin_mock: MagicMock) -> None:
-        stdin_mock.read.return_value = LIBEVENT_DEBDIFF
-        with unittest.mock.patch(
-            "builtins.open", unittest.mock.mock_open()
-        ) as mock_file:
-            main([])
-            mock_file.assert_called_once_with(
-                "libevent_2.1.12-stable-5ubuntu1.debdiff", "w", encoding="utf-8"
-            )
-        stdin_mock.read.assert_called_once_with()
+    def test_main_working_directory() -> None:
+        stdin = io.StringIO(LIBEVENT_DEBDIFF)
+        with unittest.mock.patch.object(sys, "stdin", stdin):
+            with unittest.mock.patch(
+                "builtins.open", unittest.mock.mock_open()
+            ) as mock_file:
+                main([])
+                mock_file.assert_called_once_with(
+                    "libevent_2.1.12-stable-5ubuntu1.debdiff", "w", encoding="utf-8"
+                )
 
     def test_save_debdiff(self) -> None:
-        with tempfile.TemporaryDirectory(prefix=self.PREFIX) as tmpdir:
-            filename = os.path.join(tmpdir, "debdiff")
-            save_debdiff(filename, "foobar\n", False)
-            self.assertEqual(os.listdir(tmpdir), ["debdiff"])
-            with open(filename, "r", encoding="utf-8") as written_file:
-                self.assertEqual(written_file.read(), "foobar\n")
-            stat = os.stat(filename)
-
-            # Test idempotency
-            save_debdiff(filename, "foobar\n", False)
-            self.assertEqual(os.listdir(tmpdir), ["debdiff"])
-            self.assertEqual(os.stat(filename), stat)
-
-            # Test changed content
-            self.assertRaisesRegex(
-                SystemExit, "1", save_debdiff, filename, "changed\n", False
-            )
-
-            # Test overwriting content
-            save_debdiff(filename, "changed\n", True)
-            self.assertEqual(os.listdir(tmpdir), ["debdiff"])
-            with open(filename, "r", encoding="utf-8") as written_file:
-                self.assertEqual(written_file.read(), "changed\n")
+        debdiff_path = pathlib.Path(self.tmpdir) / "debdiff"
+        filename = str(debdiff_path)
+        save_debdiff(filename, "foobar\n", False)
+        self.assertEqual(os.listdir(self.tmpdir), ["debdiff"])
+        self.assertEqual(debdiff_path.read_text(encoding="utf-8"), "foobar\n")
+        stat = os.stat(filename)
+
+        # Test idempotency
+        save_debdiff(filename, "foobar\n", False)
+        self.assertEqual(os.stat(filename), stat)
+
+        # Test changed content
+        self.assertRaisesRegex(
+            SystemExit, "1", save_debdiff, filename, "changed\n", False
+        )
+
+        # Test overwriting content
+        save_debdiff(filename, "changed\n", True)
+        self.assertEqual(debdiff_path.read_text(encoding="utf-8"), "changed\n")
@@ -19,14 +19,37 @@ import getpass
 import os
 import platform
 import subprocess
-import tempfile
 import unittest
 import unittest.mock
-from collections.abc import Callable
 from typing import Any
 
 from .scripts.schroot_wrapper import SchrootSession, main, parse_args
 
+APT_INSTALL = (
+    "env",
+    "DEBIAN_FRONTEND=noninteractive",
+    "apt-get",
+    "install",
+    "--allow-downgrades",
+    "--no-install-recommends",
+    "-y",
+)
+OS_RELEASE = platform.freedesktop_os_release()
+ROOT_CALL = ("schroot", "-c", "session-id", "-d", "/", "-u", "root", "-r", "--")
+USER = getpass.getuser()
+PROPOSED_SOURCES = (
+    "Types: deb\n"
+    "URIs: http://archive.ubuntu.com/ubuntu\n"
+    "Suites: focal-proposed\n"
+    "Components: main universe\n"
+)
+PROPOSED_PRINTF_CALL = [
+    *ROOT_CALL,
+    "sh",
+    "-c",
+    f"printf '{PROPOSED_SOURCES}' > /etc/apt/sources.list.d/ubuntu-proposed.sources",
+]
+
 
 @dataclasses.dataclass
 class RunMock:
@@ -37,272 +60,220 @@ class RunMock:
     stdout: str | None = None
     stderr: str | None = None
     call_count: int = 0
+    key: tuple[str, ...] = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.key = tuple(self.args)
 
 
-def run_side_effect(
-    responses: list[RunMock],
-) -> Callable[..., subprocess.CompletedProcess[str]]:
+class RunSideEffect:
     """Side effect for subprocess.run mocks.
 
     The args parameter from the subprocess.run call is looked up in the
-    provided `responses` list. If it is found, return the mocked
+    provided `responses`. If it is found, return the mocked
     CompletedProcess. Otherwise raise `NotImplementedError` stating the
     subprocess.run parameters.
     """
 
-    def _subprocess_run_mock(
-        args: list[str], **kwargs: Any
+    def __init__(self, responses: list[RunMock]) -> None:
+        self.table = {response.key: response for response in responses}
+        self.called: set[tuple[str, ...]] = set()
+
+    def __call__(
+        self, args: list[str], **kwargs: Any
     ) -> subprocess.CompletedProcess[str]:
-        for response in responses:
-            if response.args == args:
-                response.call_count += 1
-                return subprocess.CompletedProcess(
-                    args, response.returncode, response.stdout, response.stderr
-                )
-        extra_args = "".join([f", {k}={v!r}" for k, v in kwargs.items()])
-        raise NotImplementedError(
-            f"No response specified for subprocess.run({args=}{extra_args})"
+        response = self.table.get(tuple(args))
+        if response is None:
+            extra_args = "".join([f", {k}={v!r}" for k, v in kwargs.items()])
+            raise NotImplementedError(
+                f"No response specified for subprocess.run({args=}{extra_args})"
+            )
+        self.called.add(response.key)
+        response.call_count += 1
+        return subprocess.CompletedProcess(
+            args, response.returncode, response.stdout, response.stderr
         )
 
-    return _subprocess_run_mock
+    def not_called(self) -> set[tuple[str, ...]]:
+        """Return the args of all responses that were not called."""
+        return set(self.table) - self.called
+
+
+def _session_mocks(chroot: str, *extra: RunMock) -> list[RunMock]:
+    """Wrap the given RunMocks in a session begin and end.
+
+    Fresh begin/end RunMocks are created per call, because the responses
+    carry mutable call counts.
+    """
+    return [
+        RunMock(["schroot", "-c", chroot, "-b"], 0, "session-id\n"),
+        *extra,
+        RunMock(["schroot", "-c", "session-id", "-e"], 0),
+    ]
 
 
 class TestSchrootWrapper(unittest.TestCase):
     """Test schroot-wrapper."""
 
-    PREFIX = "schroot-wrapper-"
     maxDiff = None
 
-    def _assert_all_run_mocks_called(self, run_mocks: list[RunMock]) -> None:
-        not_called = [m for m in run_mocks if m.call_count == 0]
+    def setUp(self) -> None:
+        patcher = unittest.mock.patch("subprocess.run")
+        self.run_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _assert_all_run_mocks_called(self, side_effect: RunSideEffect) -> None:
+        not_called = side_effect.not_called()
         if not not_called:
             return
         self.fail(
             f"Following {len(not_called)} mocks were not called: {not_called}"
         )  # pragma: no cover
 
-    @unittest.mock.patch("subprocess.run")
+    @unittest.mock.patch("pathlib.Path.open", unittest.mock.mock_open())
+    @unittest.mock.patch("pathlib.Path.is_file", return_value=True)
     def test_install_packages_deb_files(
-        self, run_mock: unittest.mock.MagicMock
+        self, is_file_mock: unittest.mock.MagicMock
     ) -> None:
         """Basic test case for the main function."""
-        root_call = ["schroot", "-c", "session-id", "-d", "/", "-u", "root", "-r", "--"]
-        mocks = [
-            RunMock(["schroot", "-c", "jammy", "-b"], 0, "session-id\n"),
-            RunMock(root_call + ["apt-get", "update"], 0),
-            RunMock(root_call + ["tee", "/root/tzdata_2023c-1_all.deb"], 0),
-            RunMock(
-                root_call
-                + [
-                    "env",
-                    "DEBIAN_FRONTEND=noninteractive",
-                    "apt-get",
-                    "install",
-                    "--allow-downgrades",
-                    "--no-install-recommends",
-                    "-y",
-                    "/root/tzdata_2023c-1_all.deb",
-                ],
-                0,
-            ),
-            RunMock(["schroot", "-c", "session-id", "-e"], 0),
-        ]
-        run_mock.side_effect = run_side_effect(mocks)
+        mocks = _session_mocks(
+            "jammy",
+            RunMock([*ROOT_CALL, "apt-get", "update"], 0),
+            RunMock([*ROOT_CALL, "tee", "/root/tzdata_2023c-1_all.deb"], 0),
+            RunMock([*ROOT_CALL, *APT_INSTALL, "/root/tzdata_2023c-1_all.deb"], 0),
+        )
+        side_effect = RunSideEffect(mocks)
+        self.run_mock.side_effect = side_effect
 
-        with tempfile.TemporaryDirectory(prefix=self.PREFIX) as tmpdir:
-            deb_file = os.path.join(tmpdir, "tzdata_2023c-1_all.deb")
-            os.mknod(deb_file)
-            with SchrootSession("jammy") as session:
-                session.install_packages([deb_file])
+        deb_file = "/fake/tzdata_2023c-1_all.deb"
+        with SchrootSession("jammy") as session:
+            session.install_packages([deb_file])
 
-        self._assert_all_run_mocks_called(mocks)
-        self.assertEqual(run_mock.call_count, len(mocks))
+        is_file_mock.assert_called_once_with()
+        self._assert_all_run_mocks_called(side_effect)
+        self.assertEqual(self.run_mock.call_count, len(mocks))
 
-    @unittest.mock.patch("subprocess.run")
-    def test_main(self, run_mock: unittest.mock.MagicMock) -> None:
+    def test_main(self) -> None:
         """Basic test case for the main function."""
-        user = getpass.getuser()
-        root_call = ["schroot", "-c", "session-id", "-d", "/", "-u", "root", "-r", "--"]
-        mocks = [
-            RunMock(["schroot", "-c", "jammy", "-b"], 0, "session-id\n"),
-            RunMock(root_call + ["test", "-d", "/path"], 0),
-            RunMock(root_call + ["apt-get", "update"], 0),
+        mocks = _session_mocks(
+            "jammy",
+            RunMock([*ROOT_CALL, "test", "-d", "/path"], 0),
+            RunMock([*ROOT_CALL, "apt-get", "update"], 0),
+            RunMock([*ROOT_CALL, *APT_INSTALL, "tzdata"], 0),
             RunMock(
-                root_call
-                + [
-                    "env",
-                    "DEBIAN_FRONTEND=noninteractive",
-                    "apt-get",
-                    "install",
-                    "--allow-downgrades",
-                    "--no-install-recommends",
-                    "-y",
-                    "tzdata",
-                ],
-                0,
-            ),
-            RunMock(
-                ["schroot", "-c", "session-id", "-d", "/path", "-u", user, "-r"], 0
+                ["schroot", "-c", "session-id", "-d", "/path", "-u", USER, "-r"], 0
             ),
-            RunMock(["schroot", "-c", "session-id", "-e"], 0),
-        ]
-        run_mock.side_effect = run_side_effect(mocks)
+        )
+        side_effect = RunSideEffect(mocks)
+        self.run_mock.side_effect = side_effect
 
         self.assertEqual(main(["-p", "tzdata", "-c", "jammy", "-d", "/path"]), 0)
-        self._assert_all_run_mocks_called(mocks)
-        self.assertEqual(run_mock.call_count, len(mocks))
+        self._assert_all_run_mocks_called(side_effect)
+        self.assertEqual(self.run_mock.call_count, len(mocks))
 
-    @unittest.mock.patch("subprocess.run")
-    def test_main_fallback_home_directory(
-        self, run_mock: unittest.mock.MagicMock
-    ) -> None:
+    def test_main_fallback_home_directory(self) -> None:
         """main(): Check fall back to home directory."""
-        root_call = ["schroot", "-c", "session-id", "-d", "/", "-u", "root", "-r", "--"]
-        mocks = [
-            RunMock(["schroot", "-c", "lunar", "-b"], 0, "session-id\n"),
-            RunMock(root_call + ["test", "-d", "/non-existing"], 1),
-            RunMock(root_call + ["sh", "-c", "realpath ~me"], 0, "/home/me\n"),
-            RunMock(root_call + ["test", "-d", "/home/me"], 0),
+        mocks = _session_mocks(
+            "lunar",
+            RunMock([*ROOT_CALL, "test", "-d", "/non-existing"], 1),
+            RunMock([*ROOT_CALL, "sh", "-c", "realpath ~me"], 0, "/home/me\n"),
+            RunMock([*ROOT_CALL, "test", "-d", "/home/me"], 0),
             RunMock(
                 ["schroot", "-c", "session-id", "-d", "/home/me", "-u", "me", "-r"], 37
             ),
-            RunMock(["schroot", "-c", "session-id", "-e"], 0),
-        ]
-        run_mock.side_effect = run_side_effect(mocks)
+        )
+        side_effect = RunSideEffect(mocks)
+        self.run_mock.side_effect = side_effect
 
         self.assertEqual(main(["-c", "lunar", "-d", "/non-existing", "-u", "me"]), 37)
-        self._assert_all_run_mocks_called(mocks)
-        self.assertEqual(run_mock.call_count, len(mocks))
+        self._assert_all_run_mocks_called(side_effect)
+        self.assertEqual(self.run_mock.call_count, len(mocks))
 
-    @unittest.mock.patch("subprocess.run")
-    def test_main_missing_home_directory(
-        self, run_mock: unittest.mock.MagicMock
-    ) -> None:
+    def test_main_missing_home_directory(self) -> None:
         """main(): Check fall back to home directory and creating it."""
-        root_call = ["schroot", "-c", "session-id", "-d", "/", "-u", "root", "-r", "--"]
-        mocks = [
-            RunMock(["schroot", "-c", "lunar", "-b"], 0, "session-id\n"),
-            RunMock(root_call + ["test", "-d", "/non-existing"], 1),
-            RunMock(root_call + ["sh", "-c", "realpath ~me"], 0, "/home/me\n"),
-            RunMock(root_call + ["test", "-d", "/home/me"], 1),
-            RunMock(root_call + ["install", "-d", "-o", "me", "/home/me"], 0),
+        mocks = _session_mocks(
+            "lunar",
+            RunMock([*ROOT_CALL, "test", "-d", "/non-existing"], 1),
+            RunMock([*ROOT_CALL, "sh", "-c", "realpath ~me"], 0, "/home/me\n"),
+            RunMock([*ROOT_CALL, "test", "-d", "/home/me"], 1),
+            RunMock([*ROOT_CALL, "install", "-d", "-o", "me", "/home/me"], 0),
             RunMock(
                 ["schroot", "-c", "session-id", "-d", "/home/me", "-u", "me", "-r"], 37
             ),
-            RunMock(["schroot", "-c", "session-id", "-e"], 0),
-        ]
-        run_mock.side_effect = run_side_effect(mocks)
+        )
+        side_effect = RunSideEffect(mocks)
+        self.run_mock.side_effect = side_effect
 
         self.assertEqual(main(["-c", "lunar", "-d", "/non-existing", "-u", "me"]), 37)
-        self._assert_all_run_mocks_called(mocks)
-        self.assertEqual(run_mock.call_count, len(mocks))
+        self._assert_all_run_mocks_called(side_effect)
+        self.assertEqual(self.run_mock.call_count, len(mocks))
 
-    @unittest.mock.patch("subprocess.run")
-    def test_main_enable_ubuntu_proposed(
-        self, run_mock: unittest.mock.MagicMock
-    ) -> None:
+    def test_main_enable_ubuntu_proposed(self) -> None:
         """main(): Enable Ubuntu proposed repository."""
-        root_call = ["schroot", "-c", "session-id", "-d", "/", "-u", "root", "-r", "--"]
-        proposed_sources = (
-            "Types: deb\n"
-            "URIs: http://archive.ubuntu.com/ubuntu\n"
-            "Suites: focal-proposed\n"
-            "Components: main universe\n"
-        )
-        mocks = [
-            RunMock(["schroot", "-c", "focal", "-b"], 0, "session-id\n"),
-            RunMock(root_call + ["test", "-d", "/root"], 0),
-            RunMock(
-                root_call
-                + ["sh", "-c", '. /etc/os-release && echo "$VERSION_CODENAME"'],
-                0,
-                "focal\n",
-            ),
+        mocks = _session_mocks(
+            "focal",
+            RunMock([*ROOT_CALL, "test", "-d", "/root"], 0),
             RunMock(
-                root_call
-                + [
+                [
+                    *ROOT_CALL,
                     "sh",
                     "-c",
-                    f"printf '{proposed_sources}' "
-                    f"> /etc/apt/sources.list.d/ubuntu-proposed.sources",
-                ],
-                0,
-            ),
-            RunMock(root_call + ["apt-get", "update"], 0),
-            RunMock(
-                root_call
-                + [
-                    "env",
-                    "DEBIAN_FRONTEND=noninteractive",
-                    "apt-get",
-                    "install",
-                    "--allow-downgrades",
-                    "--no-install-recommends",
-                    "-y",
-                    "tzdata",
+                    '. /etc/os-release && echo "$VERSION_CODENAME"',
                 ],
                 0,
+                "focal\n",
             ),
+            RunMock(PROPOSED_PRINTF_CALL, 0),
+            RunMock([*ROOT_CALL, "apt-get", "update"], 0),
+            RunMock([*ROOT_CALL, *APT_INSTALL, "tzdata"], 0),
             RunMock(
                 ["schroot", "-c", "session-id", "-d", "/root", "-u", "root", "-r"], 0
             ),
-            RunMock(["schroot", "-c", "session-id", "-e"], 0),
-        ]
-        run_mock.side_effect = run_side_effect(mocks)
+        )
+        side_effect = RunSideEffect(mocks)
+        self.run_mock.side_effect = side_effect
 
         argv = ["-c", "focal", "-d", "/root", "-e", "-p", "tzdata", "-u", "root"]
         self.assertEqual(main(argv), 0)
-        self._assert_all_run_mocks_called(mocks)
-        self.assertEqual(run_mock.call_count, len(mocks))
+        self._assert_all_run_mocks_called(side_effect)
+        self.assertEqual(self.run_mock.call_count, len(mocks))
 
-    @unittest.mock.patch("subprocess.run")
-    def test_main_add_ppa(self, run_mock: unittest.mock.MagicMock) -> None:
+    def test_main_add_ppa(self) -> None:
         """main(): Add PPA APT source list."""
 
-        root_call = ["schroot", "-c", "session-id", "-d", "/", "-u", "root", "-r", "--"]
-        apt_install = [
-            "env",
-            "DEBIAN_FRONTEND=noninteractive",
-            "apt-get",
-            "install",
-            "--allow-downgrades",
-            "--no-install-recommends",
-            "-y",
-        ]
-        mocks = [
-            RunMock(["schroot", "-c", "mantic", "-b"], 0, "session-id\n"),
-            RunMock(root_call + ["test", "-d", "/"], 0),
-            RunMock(root_call + ["apt-get", "update"], 0),
+        mocks = _session_mocks(
+            "mantic",
+            RunMock([*ROOT_CALL, "test", "-d", "/"], 0),
+            RunMock([*ROOT_CALL, "apt-get", "update"], 0),
             RunMock(
-                root_call + apt_install + ["software-properties-common", "gpg-agent"], 0
+                [*ROOT_CALL, *APT_INSTALL, "software-properties-common", "gpg-agent"], 0
             ),
-            RunMock(root_call + ["add-apt-repository", "-y", "ppa:bdrung/ppa"], 0),
-            RunMock(root_call + ["add-apt-repository", "-y", "ppa:bdrung/staging"], 0),
+            RunMock([*ROOT_CALL, "add-apt-repository", "-y", "ppa:bdrung/ppa"], 0),
+            RunMock([*ROOT_CALL, "add-apt-repository", "-y", "ppa:bdrung/staging"], 0),
             RunMock(["schroot", "-c", "session-id", "-d", "/", "-u", "root", "-r"], 42),
-            RunMock(["schroot", "-c", "session-id", "-e"], 0),
-        ]
-        run_mock.side_effect = run_side_effect(mocks)
+        )
+        side_effect = RunSideEffect(mocks)
+        self.run_mock.side_effect = side_effect
 
         ppa_argv = ["--ppa", "ppa:bdrung/ppa", "--ppa", "bdrung/staging"]
         self.assertEqual(main(["-c", "mantic", "-d", "/", "-u", "root"] + ppa_argv), 42)
-        self._assert_all_run_mocks_called(mocks)
-        self.assertEqual(run_mock.call_count, len(mocks))
+        self._assert_all_run_mocks_called(side_effect)
+        self.assertEqual(self.run_mock.call_count, len(mocks))
 
     def test_parse_args_minimal(self) -> None:
         """Test parse_args() with minimal arguments."""
         args = parse_args([])
-        os_release = platform.freedesktop_os_release()
         self.assertEqual(
             args.__dict__,
             {
-                "chroot": os_release["VERSION_CODENAME"],
+                "chroot": OS_RELEASE["VERSION_CODENAME"],
                 "directory": os.getcwd(),
                 "enable_proposed": False,
                 "packages": [],
                 "ppa": [],
                 "proposed_components": ["main", "universe"],
                 "proposed_uri": "http://archive.ubuntu.com/ubuntu",
-                "user": getpass.getuser(),
+                "user": USER,
             },
         )
 
@@ -316,12 +287,9 @@ class TestSchrootWrapper(unittest.TestCase):
         args = parse_args(["--proposed-components", "main contrib non-free"])
         self.assertEqual(args.proposed_components, ["main", "contrib", "non-free"])
 
-    @unittest.mock.patch("subprocess.run")
-    def test_run_side_effect_raise_not_implemented_error(
-        self, run_mock: unittest.mock.MagicMock
-    ) -> None:
-        """Test run_side_effect() raises NotImplementedError."""
-        run_mock.side_effect = run_side_effect([])
+    def test_run_side_effect_raise_not_implemented_error(self) -> None:
+        """Test RunSideEffect raises NotImplementedError."""
+        self.run_mock.side_effect = RunSideEffect([])
         with self.assertRaisesRegex(
             NotImplementedError, r"for subprocess.run\(args=\['true'\], check=True\)$"
         ):
@@ -62,10 +62,27 @@ class TestTimelapse(unittest.TestCase):
     # pylint: disable=missing-function-docstring
     """Test timelapse."""
 
-    @unittest.mock.patch("subprocess.run")
-    def test_generate_timelapse(self, run_mock: unittest.mock.MagicMock) -> None:
+    tempdir: str
+    input_dir: pathlib.Path
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tempdir = cls.enterClassContext(
+            # pylint: disable-next=consider-using-with
+            tempfile.TemporaryDirectory(prefix="timelapse-")
+        )
+        cls.input_dir = pathlib.Path(cls.tempdir) / "Input directory"
+        cls.input_dir.mkdir()
+        shutil.copy(FIXTURES / "black_vga.jpg", cls.input_dir)
+
+    def setUp(self) -> None:
+        patcher = unittest.mock.patch("subprocess.run")
+        self.run_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_generate_timelapse(self) -> None:
         """Basic test case for generate_timelapse()."""
-        run_mock.return_value = subprocess.CompletedProcess(
+        self.run_mock.return_value = subprocess.CompletedProcess(
             unittest.mock.MagicMock(), 0, None, None
         )
         expected_cmd = [
@@ -95,12 +112,11 @@ class TestTimelapse(unittest.TestCase):
             args, pathlib.Path("output_name"), Size(1920, 1080), Size(6000, 4000)
         )
         self.assertEqual(returncode, 0)
-        run_mock.assert_called_once_with(expected_cmd, check=False)
+        self.run_mock.assert_called_once_with(expected_cmd, check=False)
 
-    @unittest.mock.patch("subprocess.run")
-    def test_ffmpeg_missing(self, run_mock: unittest.mock.MagicMock) -> None:
+    def test_ffmpeg_missing(self) -> None:
         """Basic test case for generate_timelapse()."""
-        run_mock.side_effect = FileNotFoundError(
+        self.run_mock.side_effect = FileNotFoundError(
             errno.ENOENT, os.strerror(errno.ENOENT), "ffmpeg"
         )
         args = parse_args([])
@@ -115,75 +131,69 @@ class TestTimelapse(unittest.TestCase):
             "^ERROR.*ffmpeg not found. Please install ffmpeg!$",
         )
         self.assertEqual(returncode, 1)
-        run_mock.assert_called_once()
+        self.run_mock.assert_called_once()
 
     def test_input_directory_is_not_a_directory(self) -> None:
         with self.assertRaisesRegex(SystemExit, "^2$"):
             parse_args(["-d", "/non-existing"])
 
-    @unittest.mock.patch("subprocess.run")
-    def test_main(self, run_mock: unittest.mock.MagicMock) -> None:
-        run_mock.return_value = subprocess.CompletedProcess(
+    @unittest.mock.patch.object(Size, "from_image", return_value=Size(640, 480))
+    def test_main(self, from_image_mock: unittest.mock.MagicMock) -> None:
+        self.run_mock.return_value = subprocess.CompletedProcess(
             unittest.mock.MagicMock(), 0, None, None
         )
-        with tempfile.TemporaryDirectory() as tempdir:
-            input_dir = pathlib.Path(tempdir) / "Input directory"
-            input_dir.mkdir()
-            expected_cmd = [
-                "ffmpeg",
-                "-r",
-                "24",
-                "-f",
-                "image2",
-                "-pattern_type",
-                "glob",
-                "-i",
-                f"{input_dir}/*.jpg",
-                "-filter:v",
-                "crop=640:360:0:60,scale=1920:1080",
-                "-vcodec",
-                "libx264",
-                "-crf",
-                "17",
-                "-pix_fmt",
-                "yuv420p",
-                "-profile:v",
-                "high",
-                "Input_directory_1920x1080_24fps_libx264_crf17.mp4",
-            ]
-            shutil.copy(FIXTURES / "black_vga.jpg", input_dir)
-            self.assertEqual(main(["-d", str(input_dir), "--crf", "17"]), 0)
-        run_mock.assert_called_once_with(expected_cmd, check=False)
+        expected_cmd = [
+            "ffmpeg",
+            "-r",
+            "24",
+            "-f",
+            "image2",
+            "-pattern_type",
+            "glob",
+            "-i",
+            f"{self.input_dir}/*.jpg",
+            "-filter:v",
+            "crop=640:360:0:60,scale=1920:1080",
+            "-vcodec",
+            "libx264",
+            "-crf",
+            "17",
+            "-pix_fmt",
+            "yuv420p",
+            "-profile:v",
+            "high",
+            "Input_directory_1920x1080_24fps_libx264_crf17.mp4",
+        ]
+        self.assertEqual(main(["-d", str(self.input_dir), "--crf", "17"]), 0)
+        self.run_mock.assert_called_once_with(expected_cmd, check=False)
+        from_image_mock.assert_called_once_with(self.input_dir / "black_vga.jpg")
 
     def test_no_input_images(self) -> None:
-        with tempfile.TemporaryDirectory() as tempdir:
-            self.assertEqual(main(["-d", tempdir]), 1)
+        empty_dir = tempfile.mkdtemp(dir=self.tempdir)
+        self.assertEqual(main(["-d", empty_dir]), 1)
 
     def test_output_directory_is_not_a_directory(self) -> None:
         with self.assertRaisesRegex(SystemExit, "^2$"):
             parse_args(["-o", "/non-existing"])
 
-    @unittest.mock.patch("subprocess.run")
-    def test_output_video_exists(self, run_mock: unittest.mock.MagicMock) -> None:
-        with tempfile.TemporaryDirectory() as tempdir:
-            input_dir = pathlib.Path(tempdir) / "Input directory"
-            input_dir.mkdir()
-            shutil.copy(FIXTURES / "black_vga.jpg", input_dir)
-            output_video = (
-                pathlib.Path(tempdir) / "output_1920x1080_24fps_libx264_crf23.mp4"
-            )
-            output_video.touch()
-            self.assertEqual(
-                main(
-                    [
-                        "-d",
-                        str(input_dir),
-                        "-o",
-                        str(output_video.parent),
-                        "-n",
-                        "output",
-                    ]
-                ),
-                0,
-            )
-        run_mock.assert_not_called()
+    @unittest.mock.patch.object(Size, "from_image", return_value=Size(640, 480))
+    def test_output_video_exists(
+        self, _from_image_mock: unittest.mock.MagicMock
+    ) -> None:
+        output_dir = pathlib.Path(tempfile.mkdtemp(dir=self.tempdir))
+        output_video = output_dir / "output_1920x1080_24fps_libx264_crf23.mp4"
+        output_video.touch()
+        self.assertEqual(
+            main(
+                [
+                    "-d",
+                    str(self.input_dir),
+                    "-o",
+                    str(output_dir),
+                    "-n",
+                    "output",
+                ]
+            ),
+            0,
+        )
+        self.run_mock.assert_not_called()
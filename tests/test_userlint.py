@@ -14,8 +14,7 @@
 
 """Test userlint."""
 
-import subprocess
-import tempfile
+import dataclasses
 import unittest
 import unittest.mock
 
@@ -29,6 +28,32 @@ from .scripts.userlint import (
 )
 
 
+@dataclasses.dataclass
+class SignatureMock:
+    """Mocked pygit2.Signature (which forbids an empty name or email)."""
+
+    name: str
+    email: str
+
+
+@dataclasses.dataclass
+class CommitMock:
+    """Mocked pygit2.Commit."""
+
+    author: SignatureMock
+    committer: SignatureMock
+    id: str = "0" * 40
+
+
+def _commit_mock(
+    author: tuple[str, str], committer: tuple[str, str] | None = None
+) -> CommitMock:
+    """Return a mocked commit (committer defaults to the author)."""
+    if committer is None:
+        committer = author
+    return CommitMock(SignatureMock(*author), SignatureMock(*committer))
+
+
 class TestPerson(unittest.TestCase):
     # pylint: disable=missing-function-docstring
     """Test Person class."""
@@ -83,19 +108,25 @@ class TestPerson(unittest.TestCase):
         )
 
     def test_repr(self) -> None:
-        # pylint: disable=eval-used
         person = Person("Benjamin Drung", "bdrung@ubuntu.com", "function")
-        self.assertEqual(eval(repr(person)), person)
+        self.assertEqual(
+            repr(person),
+            "Person(name='Benjamin Drung', email='bdrung@ubuntu.com',"
+            " function='function')",
+        )
 
     def test_repr_author(self) -> None:
-        # pylint: disable=eval-used
         author = Author("Benjamin Drung", "bdrung@ubuntu.com")
-        self.assertEqual(eval(repr(author)), author)
+        self.assertEqual(
+            repr(author), "Author(name='Benjamin Drung', email='bdrung@ubuntu.com')"
+        )
 
     def test_repr_committer(self) -> None:
-        # pylint: disable=eval-used
         committer = Committer("Benjamin Drung", "bdrung@ubuntu.com")
-        self.assertEqual(eval(repr(committer)), committer)
+        self.assertEqual(
+            repr(committer),
+            "Committer(name='Benjamin Drung', email='bdrung@ubuntu.com')",
+        )
 
     def test_sort(self) -> None:
         person1 = Author("John Doe", "john.doe@example.com")
@@ -107,8 +138,6 @@ class TestUserlint(unittest.TestCase):
     # pylint: disable=missing-function-docstring
     """Test userlint."""
 
-    PREFIX = "userlint-"
-
     def test_valid_email_address(self) -> None:
         self.assertTrue(is_valid_email("bdrung@ubuntu.com"))
 
@@ -130,26 +159,14 @@ class TestUserlint(unittest.TestCase):
     def test_user_name_is_nickname(self) -> None:
         self.assertFalse(is_valid_name("mathiaz"))
 
-    @staticmethod
-    def _commit(directory: str, message: str, author: str | None = None) -> None:
-        cmd = ["git", "commit", "--allow-empty", "-m", message]
-        if author:
-            cmd.append(f"--author={author}")
-        subprocess.run(cmd, check=True, cwd=directory)
-
-    def _prepare_git_repository(self, directory: str, name: str, email: str) -> None:
-        subprocess.run(["git", "init", "-b", "main"], check=True, cwd=directory)
-        subprocess.run(["git", "config", "user.name", name], check=True, cwd=directory)
-        subprocess.run(
-            ["git", "config", "user.email", email], check=True, cwd=directory
-        )
-        self._commit(directory, "Initial commit")
+    VALID = ("Benjamin Drung", "bdrung@ubuntu.com")
+    INVALID = ("bdrung@ubuntu.com", "")
 
-    def test_main(self) -> None:
-        with tempfile.TemporaryDirectory(prefix=self.PREFIX) as tmpdir:
-            self._prepare_git_repository(tmpdir, "Benjamin Drung", "bdrung@ubuntu.com")
-            with self.assertLogs(level="INFO") as context_manager:
-                self.assertEqual(main(["-d", tmpdir]), 0)
+    @unittest.mock.patch("pygit2.Repository")
+    def test_main(self, repository_mock: unittest.mock.MagicMock) -> None:
+        repository_mock.return_value.walk.return_value = [_commit_mock(self.VALID)]
+        with self.assertLogs(level="INFO") as context_manager:
+            self.assertEqual(main(["-d", "/repo"]), 0)
 
         self.assertEqual(len(context_manager.output), 1, context_manager.output)
         self.assertRegex(
@@ -157,11 +174,11 @@ class TestUserlint(unittest.TestCase):
             "^INFO:.*:Checked 1 commits, found 1 valid and no invalid entries.$",
         )
 
-    def test_main_invalid(self) -> None:
-        with tempfile.TemporaryDirectory(prefix=self.PREFIX) as tmpdir:
-            self._prepare_git_repository(tmpdir, "bdrung@ubuntu.com", "")
-            with self.assertLogs(level="INFO") as context_manager:
-                self.assertEqual(main(["-d", tmpdir]), 1)
+    @unittest.mock.patch("pygit2.Repository")
+    def test_main_invalid(self, repository_mock: unittest.mock.MagicMock) -> None:
+        repository_mock.return_value.walk.return_value = [_commit_mock(self.INVALID)]
+        with self.assertLogs(level="INFO") as context_manager:
+            self.assertEqual(main(["-d", "/repo"]), 1)
 
         self.assertEqual(len(context_manager.output), 1, context_manager.output)
         self.assertRegex(
@@ -170,12 +187,16 @@ class TestUserlint(unittest.TestCase):
             "bdrung@ubuntu.com <>$",
         )
 
-    def test_main_suggest_mailmap(self) -> None:
-        with tempfile.TemporaryDirectory(prefix=self.PREFIX) as tmpdir:
-            self._prepare_git_repository(tmpdir, "Benjamin Drung", "bdrung@ubuntu.com")
-            self._commit(tmpdir, "Second commit", "bdrung@ubuntu.com <>")
-            with self.assertLogs(level="INFO") as context_manager:
-                self.assertEqual(main(["-d", tmpdir]), 1)
+    @unittest.mock.patch("pygit2.Repository")
+    def test_main_suggest_mailmap(
+        self, repository_mock: unittest.mock.MagicMock
+    ) -> None:
+        repository_mock.return_value.walk.return_value = [
+            _commit_mock(self.INVALID, self.VALID),
+            _commit_mock(self.VALID),
+        ]
+        with self.assertLogs(level="INFO") as context_manager:
+            self.assertEqual(main(["-d", "/repo"]), 1)
 
         self.assertEqual(len(context_manager.output), 2, context_manager.output)
         self.assertRegex(